@@ -1,4 +1,3 @@
-from frozendict import frozendict
 from nbt import nbt
 
 from .legacy import LEGACY_ID_MAP
@@ -18,7 +17,7 @@ class Block:
         Block properties as a dict
     """
 
-    __slots__ = ("namespace", "id", "properties")
+    __slots__ = ("namespace", "id", "properties", "_hash")
 
     def __init__(self, namespace: str, block_id: str = None, properties: dict = None):
         """
@@ -39,6 +38,7 @@ class Block:
             self.namespace = namespace
             self.id = block_id
         self.properties = properties or {}
+        self._hash = None
 
     def name(self) -> str:
         """
@@ -59,7 +59,16 @@ class Block:
         )
 
     def __hash__(self):
-        return hash(self.name()) ^ hash(frozendict(self.properties))
+        # Cached as sections hash the same block thousands of times when
+        # building palettes. Mutating self.properties after the first hash
+        # will not be picked up
+        if self._hash is None:
+            # Imported lazily as hashing is the only thing frozendict
+            # is needed for
+            from frozendict import frozendict
+
+            self._hash = hash(self.name()) ^ hash(frozendict(self.properties))
+        return self._hash
 
     @classmethod
     def from_name(cls, name: str, *args, **kwargs):
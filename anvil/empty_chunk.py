@@ -79,19 +79,23 @@ class EmptyChunk:
             Returns ``None`` if the section is empty, meaning the block
             is most likely an air block.
         """
-        if x < 0 or x > 15:
-            raise OutOfBoundsCoordinates(f"X ({x!r}) must be in range of 0 to 15")
-        if z < 0 or z > 15:
-            raise OutOfBoundsCoordinates(f"Z ({z!r}) must be in range of 0 to 15")
-        if y < YMIN or y > YMAX:
-            raise OutOfBoundsCoordinates(f'Y ({y!r}) must be in range of {YMIN} to {YMAX}')
-
-        section = self.sections[y // 16]
+        # The bounds checks compile away under python -O,
+        # as they're on the hot path of bulk block access
+        if __debug__:
+            if x < 0 or x > 15:
+                raise OutOfBoundsCoordinates(f"X ({x!r}) must be in range of 0 to 15")
+            if z < 0 or z > 15:
+                raise OutOfBoundsCoordinates(f"Z ({z!r}) must be in range of 0 to 15")
+            if y < YMIN or y > YMAX:
+                raise OutOfBoundsCoordinates(f'Y ({y!r}) must be in range of {YMIN} to {YMAX}')
+
+        sy = y >> 4
+        section = self.sections[sy]
 
         if section is None:
             return
 
-        return section.get_block(x, y % 16, z)
+        return section.get_block(x, y & 15, z)
 
     def set_block(self, block: Block, x: int, y: int, z: int):
         """
@@ -114,17 +118,20 @@ class EmptyChunk:
             If X, Y or Z are not in the proper range
 
         """
-        if x < 0 or x > 15:
-            raise OutOfBoundsCoordinates(f"X ({x!r}) must be in range of 0 to 15")
-        if z < 0 or z > 15:
-            raise OutOfBoundsCoordinates(f"Z ({z!r}) must be in range of 0 to 15")
-        if y < YMIN or y > YMAX:
-            raise OutOfBoundsCoordinates(f'Y ({y!r}) must be in range of {YMIN} to {YMAX}')
-        section = self.sections[y // 16]
+        # Same as get_block, the bounds checks compile away under python -O
+        if __debug__:
+            if x < 0 or x > 15:
+                raise OutOfBoundsCoordinates(f"X ({x!r}) must be in range of 0 to 15")
+            if z < 0 or z > 15:
+                raise OutOfBoundsCoordinates(f"Z ({z!r}) must be in range of 0 to 15")
+            if y < YMIN or y > YMAX:
+                raise OutOfBoundsCoordinates(f'Y ({y!r}) must be in range of {YMIN} to {YMAX}')
+        sy = y >> 4
+        section = self.sections[sy]
         if section is None:
-            section = EmptySection(y // 16)
+            section = EmptySection(sy)
             self.add_section(section)
-        section.set_block(block, x, y % 16, z)
+        section.set_block(block, x, y & 15, z)
 
     def save(self) -> nbt.NBTFile:
         """
@@ -1,7 +1,8 @@
-import math
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from typing import BinaryIO, List, Union
+from struct import pack_into
+from typing import BinaryIO, Dict, Optional, Tuple, Union
 
 from nbt import nbt
 
@@ -15,9 +16,8 @@ from .constants import YMIN, YMAX
 
 
 def from_inclusive(a, b):
-    """Returns a range from a to b, including both endpoints"""
-    c = int(b > a) * 2 - 1
-    return range(a, b + c, c)
+    """Returns an ascending range from a to b, including both endpoints"""
+    return range(min(a, b), max(a, b) + 1)
 
 
 class EmptyRegion:
@@ -26,8 +26,8 @@ class EmptyRegion:
 
     Attributes
     ----------
-    chunks: List[:class:`anvil.EmptyChunk`]
-        List of chunks in this region
+    chunks: Dict[Tuple[:class:`int`, :class:`int`], :class:`anvil.EmptyChunk`]
+        Chunks in this region, keyed by their in-region (x, z) coordinates
     x: :class:`int`
     z: :class:`int`
     """
@@ -35,8 +35,9 @@ class EmptyRegion:
     __slots__ = ("chunks", "x", "z")
 
     def __init__(self, x: int, z: int):
-        # Create a 1d list for the 32x32 chunks
-        self.chunks: List[EmptyChunk] = [None] * 1024
+        # Chunks are stored sparsely, as most of the 32x32 grid
+        # is usually empty
+        self.chunks: Dict[Tuple[int, int], EmptyChunk] = {}
         self.x = x
         self.z = z
 
@@ -78,7 +79,7 @@ class EmptyRegion:
         """
         if not self.inside(x, 0, z, chunk=True):
             raise OutOfBoundsCoordinates(f"Chunk ({x}, {z}) is not inside this region")
-        return self.chunks[z % 32 * 32 + x % 32]
+        return self.chunks.get((x & 31, z & 31))
 
     def add_chunk(self, chunk: EmptyChunk):
         """
@@ -98,7 +99,7 @@ class EmptyRegion:
             raise OutOfBoundsCoordinates(
                 f"Chunk ({chunk.x}, {chunk.z}) is not inside this region"
             )
-        self.chunks[chunk.z % 32 * 32 + chunk.x % 32] = chunk
+        self.chunks[(chunk.x & 31, chunk.z & 31)] = chunk
 
     def add_section(self, section: EmptySection, x: int, z: int, replace: bool = True):
         """
@@ -123,7 +124,7 @@ class EmptyRegion:
         """
         if not self.inside(x, 0, z, chunk=True):
             raise OutOfBoundsCoordinates(f"Chunk ({x}, {z}) is not inside this region")
-        chunk = self.chunks[z % 32 * 32 + x % 32]
+        chunk = self.chunks.get((x & 31, z & 31))
         if chunk is None:
             chunk = EmptyChunk(x, z)
             self.add_chunk(chunk)
@@ -154,13 +155,15 @@ class EmptyRegion:
             raise OutOfBoundsCoordinates(
                 f"Block ({x}, {y}, {z}) is not inside this region"
             )
-        cx = x // 16
-        cz = z // 16
+        # Shifts and masks match floor division and modulo
+        # for negative coordinates too
+        cx = x >> 4
+        cz = z >> 4
         chunk = self.get_chunk(cx, cz)
         if chunk is None:
             chunk = EmptyChunk(cx, cz)
             self.add_chunk(chunk)
-        chunk.set_block(block, x % 16, y, z % 16)
+        chunk.set_block(block, x & 15, y, z & 15)
 
     def set_if_inside(self, block: Block, x: int, y: int, z: int):
         """
@@ -238,7 +241,7 @@ class EmptyRegion:
                     else:
                         self.set_block(block, x, y, z)
 
-    def save(self, file: Union[str, BinaryIO] = None) -> bytes:
+    def save(self, file: Union[str, BinaryIO] = None) -> Optional[bytes]:
         """
         Returns the region as bytes with
         the anvil file format structure,
@@ -248,15 +251,16 @@ class EmptyRegion:
         ----------
         file
             Either a path or a file object, if given region
-            will be saved there.
+            will be written there instead and nothing is returned.
         """
-        # Store all the chunks data as zlib compressed nbt data
-        chunks_data = []
-        for chunk in self.chunks:
+        # Serialize every chunk to uncompressed nbt data first,
+        # iterating the 32x32 grid in header order
+        nbt_payloads = []
+        for i in range(1024):
+            chunk = self.chunks.get((i & 31, i >> 5))
             if chunk is None:
-                chunks_data.append(None)
+                nbt_payloads.append(None)
                 continue
-            chunk_data = BytesIO()
             if isinstance(chunk, Chunk):
                 nbt_data = nbt.NBTFile()
                 nbt_data.tags.append(
@@ -264,58 +268,96 @@ class EmptyRegion:
                 )
                 nbt_data.tags.append(chunk.data)
             else:
+                if not any(chunk.sections):
+                    # A chunk without a single section has no blocks in it,
+                    # so treat it like a non-generated chunk and skip the
+                    # NBT and compression work entirely
+                    nbt_payloads.append(None)
+                    continue
                 nbt_data = chunk.save()
-            nbt_data.write_file(buffer=chunk_data)
-            chunk_data.seek(0)
-            chunk_data = zlib.compress(chunk_data.read())
-            chunks_data.append(chunk_data)
-
-        # This is what is added after the location and timestamp header
-        chunks_bytes = bytes()
+            buf = BytesIO()
+            nbt_data.write_file(buffer=buf)
+            # getbuffer() is a view of the buffer, so no seek+read copy is needed
+            nbt_payloads.append(buf.getbuffer())
+
+        # Compress the chunks in parallel, zlib releases the GIL so threads
+        # actually run concurrently here. Each chunk has to be its own
+        # complete zlib stream, as Minecraft decompresses them independently,
+        # so a compressor object cannot be shared between chunks
+        def compress(payload):
+            return None if payload is None else zlib.compress(payload)
+
+        with ThreadPoolExecutor() as pool:
+            # map() keeps the chunk order, so the sector layout stays deterministic
+            chunks_data = list(pool.map(compress, nbt_payloads))
+
+        # Figure out each chunk's sector offset and count up front,
+        # so the whole payload buffer can be allocated in one go.
+        # Each chunk takes 5 extra bytes (4 for length, 1 for compression type)
+        # and is padded to a multiple of 4KiB; 4096 is a power of two
+        # so the sector math can be plain shifts and masks
         offsets = []
+        total_size = 0
         for chunk in chunks_data:
             if chunk is None:
                 offsets.append(None)
                 continue
-            # 4 bytes are for length, b'\x02' is the compression type which is 2 since its using zlib
-            to_add = (len(chunk) + 1).to_bytes(4, "big") + b"\x02" + chunk
-
-            # offset in 4KiB sectors
-            sector_offset = len(chunks_bytes) // 4096
-            sector_count = math.ceil(len(to_add) / 4096)
-            offsets.append((sector_offset, sector_count))
-
-            # Padding to be a multiple of 4KiB long
-            to_add += bytes(4096 - (len(to_add) % 4096))
-            chunks_bytes += to_add
-
-        locations_header = bytes()
-        for offset in offsets:
+            sector_count = (len(chunk) + 5 + 4095) >> 12
+            offsets.append((total_size >> 12, sector_count))
+            total_size += sector_count << 12
+
+        # The file starts with a 4KiB locations header and a 4KiB timestamps
+        # header (timestamps all stay 0), then the chunk payloads
+        locations_header = bytearray(4096)
+        for i, offset in enumerate(offsets):
             # None means the chunk is not an actual chunk in the region
-            # and will be 4 null bytes, which represents non-generated chunks to minecraft
+            # and stays as 4 null bytes, which represents non-generated chunks to minecraft
             if offset is None:
-                locations_header += bytes(4)
-            else:
-                # offset is (sector offset, sector count)
-                locations_header += (offset[0] + 2).to_bytes(3, "big") + offset[
-                    1
-                ].to_bytes(1, "big")
-
-        # Set them all as 0
-        timestamps_header = bytes(4096)
+                continue
+            # offset is (sector offset, sector count), packed as a 3 byte
+            # offset followed by a 1 byte count
+            pack_into(">I", locations_header, i * 4, (offset[0] + 2) << 8 | offset[1])
 
-        final = locations_header + timestamps_header + chunks_bytes
+        # When saving to a file, write it out sector by sector so peak
+        # memory is bounded by the compressed chunks instead of also
+        # holding a full copy of the assembled file
+        if file:
 
-        # Pad file to be a multiple of 4KiB in size
-        # as Minecraft only accepts region files that are like that
-        final += bytes(4096 - (len(final) % 4096))
-        assert len(final) % 4096 == 0  # just in case
+            def write_region(f):
+                f.write(locations_header)
+                f.write(bytes(4096))  # timestamps
+                for chunk in chunks_data:
+                    if chunk is None:
+                        continue
+                    f.write((len(chunk) + 1).to_bytes(4, "big"))
+                    # b'\x02' is the compression type, which is 2 since its using zlib
+                    f.write(b"\x02")
+                    f.write(chunk)
+                    # Padding to a multiple of 4KiB
+                    f.write(bytes(-(len(chunk) + 5) & 4095))
 
-        # Save to a file if it was given
-        if file:
             if isinstance(file, str):
                 with open(file, "wb") as f:
-                    f.write(final)
+                    write_region(f)
             else:
-                file.write(final)
-        return final
+                write_region(file)
+            return
+
+        # Otherwise allocate the whole file in one buffer; both the
+        # inter-chunk padding and the trailing padding are already
+        # zeroed by the preallocation
+        final = bytearray(8192 + total_size)
+        final[:4096] = locations_header
+
+        for chunk, offset in zip(chunks_data, offsets):
+            if chunk is None:
+                continue
+            cursor = 8192 + (offset[0] << 12)
+            final[cursor : cursor + 4] = (len(chunk) + 1).to_bytes(4, "big")
+            # 2 is the compression type, which is 2 since its using zlib
+            final[cursor + 4] = 2
+            final[cursor + 5 : cursor + 5 + len(chunk)] = chunk
+
+        # Minecraft only accepts region files that are a multiple of 4KiB long
+        assert len(final) % 4096 == 0  # just in case
+        return bytes(final)
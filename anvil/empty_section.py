@@ -5,6 +5,7 @@ from typing import List, Tuple
 from nbt import nbt
 
 from . import Block
+from .chunk import bin_append
 from .errors import OutOfBoundsCoordinates
 
 
@@ -16,9 +17,46 @@ def _update_fmt(self, length):
 nbt.TAG_Long_Array.update_fmt = _update_fmt
 
 
-def bin_append(a, b, length=None):
-    length = length or b.bit_length()
-    return (a << length) | b
+# Block property values are saved as strings:
+# booleans as either 'true' or 'false', and ints also seem to be saved
+# as a string. Keyed by exact type so bool doesn't fall into int
+_PROPERTY_ENCODERS = {
+    str: lambda value: value,
+    bool: lambda value: str(value).lower(),
+    int: str,
+}
+
+# Palette tags built by _palette_tag, keyed by block.
+# The same few blocks show up in every section of a region,
+# so their tags only need to be built once
+_PALETTE_TAG_CACHE = {}
+
+
+def _palette_tag(block: Block) -> nbt.TAG_Compound:
+    """
+    Returns the palette entry tag for given block,
+    reusing a cached tag if the block was seen before.
+
+    The tag is shared, so it must not be mutated by callers.
+    """
+    tag = _PALETTE_TAG_CACHE.get(block)
+    if tag is not None:
+        return tag
+    tag = nbt.TAG_Compound()
+    tag.tags.append(nbt.TAG_String(name="Name", value=block.name()))
+    if block.properties:
+        properties = nbt.TAG_Compound()
+        properties.name = "Properties"
+        for key, value in block.properties.items():
+            encoder = _PROPERTY_ENCODERS.get(type(value))
+            if encoder is None:
+                # assume its a nbt tag and just append it
+                properties.tags.append(value)
+            else:
+                properties.tags.append(nbt.TAG_String(name=key, value=encoder(value)))
+        tag.tags.append(properties)
+    _PALETTE_TAG_CACHE[block] = tag
+    return tag
 
 
 class EmptySection:
@@ -173,29 +211,7 @@ class EmptySection:
         palette = self.palette()
         nbt_pal = nbt.TAG_List(name="Palette", type=nbt.TAG_Compound)
         for block in palette:
-            tag = nbt.TAG_Compound()
-            tag.tags.append(nbt.TAG_String(name="Name", value=block.name()))
-            if block.properties:
-                properties = nbt.TAG_Compound()
-                properties.name = "Properties"
-                for key, value in block.properties.items():
-                    if isinstance(value, str):
-                        properties.tags.append(nbt.TAG_String(name=key, value=value))
-                    elif isinstance(value, bool):
-                        # booleans are a string saved as either 'true' or 'false'
-                        properties.tags.append(
-                            nbt.TAG_String(name=key, value=str(value).lower())
-                        )
-                    elif isinstance(value, int):
-                        # ints also seem to be saved as a string
-                        properties.tags.append(
-                            nbt.TAG_String(name=key, value=str(value))
-                        )
-                    else:
-                        # assume its a nbt tag and just append it
-                        properties.tags.append(value)
-                tag.tags.append(properties)
-            nbt_pal.tags.append(tag)
+            nbt_pal.tags.append(_palette_tag(block))
         root.tags.append(nbt_pal)
 
         states = self.blockstates(palette=palette)
@@ -1,15 +1,10 @@
 import array
-from typing import Iterable, List, Sequence, Tuple
+from typing import Iterable, Sequence
 
 from nbt import nbt
 
 from . import Block, EmptySection
-from .errors import OutOfBoundsCoordinates
-
-
-def bin_append(a, b, length=None):
-    length = length or b.bit_length()
-    return (a << length) | b
+from .chunk import bin_append
 
 
 class RawSection:
@@ -39,8 +34,13 @@ class RawSection:
         """Returns ``self._palette``"""
         return self._palette
 
-    def blockstates(self, _palette: Sequence[Block] = None) -> array.array:
-        """Refer to :class:`EmptySection.blockstates()`"""
+    def blockstates(self, palette: Sequence[Block] = None) -> array.array:
+        """
+        Refer to :class:`EmptySection.blockstates()`
+
+        The palette argument is ignored and only accepted so
+        :class:`EmptySection.save()` can call this the same way
+        """
         bits = max((len(self._palette) - 1).bit_length(), 4)
         states = array.array("Q")
         current = 0
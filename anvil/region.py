@@ -1,5 +1,6 @@
 import zlib
 from io import BytesIO
+from struct import unpack_from
 from typing import BinaryIO, Tuple, Union
 
 from nbt import nbt
@@ -8,6 +9,12 @@ import anvil
 
 from .errors import GZipChunkData
 
+# Decompressors indexed by the chunk's compression type:
+# 2 is zlib and 3 is uncompressed, where bytes just materializes the view.
+# 1 (gzip) is unsupported and raises before the lookup, and 0 keeps the
+# old behaviour of assuming zlib
+_DECOMPRESSORS = (zlib.decompress, None, zlib.decompress, bytes)
+
 
 class Region:
     """
@@ -54,9 +61,10 @@ class Region:
             Chunk's Z value
         """
         b_off = self.header_offset(chunk_x, chunk_z)
-        off = int.from_bytes(self.data[b_off : b_off + 3], byteorder="big")
-        sectors = self.data[b_off + 3]
-        return off, sectors
+        # The entry is a 3 byte sector offset and a 1 byte sector count,
+        # read as one big-endian u32 without slicing
+        (location,) = unpack_from(">I", self.data, b_off)
+        return location >> 8, location & 0xFF
 
     def chunk_data(self, chunk_x: int, chunk_z: int) -> nbt.NBTFile:
         """
@@ -79,12 +87,19 @@ class Region:
         if off == (0, 0):
             return
         off = off[0] * 4096
-        length = int.from_bytes(self.data[off : off + 4], byteorder="big")
-        compression = self.data[off + 4]  # 2 most of the time
+        (length,) = unpack_from(">I", self.data, off)
+        # Slicing a memoryview doesn't copy the chunk data like slicing bytes would
+        data = memoryview(self.data)
+        compression = data[off + 4]  # 2 most of the time
         if compression == 1:
             raise GZipChunkData("GZip is not supported")
-        compressed_data = self.data[off + 5 : off + 5 + length - 1]
-        return nbt.NBTFile(buffer=BytesIO(zlib.decompress(compressed_data)))
+        compressed_data = data[off + 5 : off + 5 + length - 1]
+        decompress = (
+            _DECOMPRESSORS[compression]
+            if compression < len(_DECOMPRESSORS)
+            else zlib.decompress
+        )
+        return nbt.NBTFile(buffer=BytesIO(decompress(compressed_data)))
 
     def get_chunk(self, chunk_x: int, chunk_z: int) -> "anvil.Chunk":
         """